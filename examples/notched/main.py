@@ -13,6 +13,7 @@ def main():
     with rp.gmsh.Manager(output_dir=output_dir, model_name="Notched specimen") as gm:
         gm.create_notched()
         gm.export_mesh()
+    rp.gmsh.shutdown()  # finalize Gmsh once no further meshes are needed
 
     # Access Gmsh manager's properties outside of `with` statement
     logging.info(gm.mesh_data["nodes"])
@@ -20,12 +21,13 @@ def main():
     logging.info(gm.mesh_file)
 
     # Import mesh data to create PyVista's `UnstructuredGrid`
-    pv_set = rp.pyvista.Settings()
-    with rp.pyvista.Manager(output_dir=output_dir, mesh_data=gm.mesh_data) as pm:
-        pm.plot(pv_set=pv_set, quantity_name="mesh")
+    mesh = rp.pyvista.get_mesh(gm.mesh_data)
+    logging.info(mesh)
 
-    # Access PyVista manager's properties outside of `with` statement
-    logging.info(pm.mesh)
+    # Plot mesh using PyVista
+    pv_set = rp.pyvista.Settings()
+    pm = rp.pyvista.Manager(output_dir=output_dir, mesh_data=mesh)
+    pm.plot(pv_set=pv_set, quantity_name="mesh")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,108 @@
+import hashlib
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import gmsh
 import numpy as np
 
+# Number of nodes per element by Gmsh element type
+_GMSH_ELEMENT_NODES = {
+    3: 4,  # bi-linear quadrilateral elements
+    5: 8,  # tri-linear hexahedral elements
+    10: 9,  # bi-quadratic quadrilateral elements
+    12: 27,  # tri-quadratic hexahedral elements
+}
+
+# VTK cell type number by Gmsh element type, see: https://vtk.org/doc/nightly/html/vtkCellType_8h_source.html
+_GMSH_TO_VTK = {
+    3: 9,  # VTK_QUAD
+    5: 12,  # VTK_HEXAHEDRON
+    10: 28,  # VTK_BIQUADRATIC_QUAD
+    12: 29,  # VTK_TRIQUADRATIC_HEXAHEDRON
+}
+
+# VTK cell type numbers by number of nodes per element
+_VTK_CELL_TYPES = {_GMSH_ELEMENT_NODES[element_type]: vtk_num for element_type, vtk_num in _GMSH_TO_VTK.items()}
+
+_MESH_CACHE_DIR = Path.home() / Path(".cache") / Path("rippl")  # stable across runs, unlike timestamped output directories
+_GMSH_REFS = 0  # number of active managers sharing the Gmsh session
+_OPTION_CACHE: dict[str, float] = {}  # last values written to Gmsh's (global) options database
+
+
+def _vtk_cell_type(num_nodes_per_element: int) -> int:
+    """
+    Get VTK cell type number
+
+    See: https://vtk.org/doc/nightly/html/vtkCellType_8h_source.html
+    """
+
+    try:
+        return _VTK_CELL_TYPES[num_nodes_per_element]
+    except KeyError:
+        raise ValueError("Used cell type is not implemented!")
+
+
+def create_rectangle_analytic(
+    width: float = 1.0,
+    height: float = 1.0,
+    num_elements_x: int = 10,
+    num_elements_y: int = 10,
+) -> dict:
+    """Create mesh data of a structured rectangle with bi-linear quadrilateral elements directly, without Gmsh"""
+
+    # Nodes on regular grid, numbered row by row starting at bottom left point
+    x = np.linspace(0.0, width, num_elements_x + 1)
+    y = np.linspace(0.0, height, num_elements_y + 1)
+    nodes = np.zeros(((num_elements_x + 1) * (num_elements_y + 1), 3))
+    nodes[:, 0] = np.tile(x, num_elements_y + 1)
+    nodes[:, 1] = np.repeat(y, num_elements_x + 1)
+    num_nodes = nodes.shape[0]
+
+    # Elements given counterclockwise by their bottom left node
+    iy, ix = np.mgrid[0:num_elements_y, 0:num_elements_x]
+    bottom_left = (iy * (num_elements_x + 1) + ix).ravel()
+    elements = np.column_stack(
+        [
+            bottom_left,
+            bottom_left + 1,
+            bottom_left + num_elements_x + 2,
+            bottom_left + num_elements_x + 1,
+        ]
+    ).astype(np.int64, copy=False)
+
+    return {
+        "nodes": nodes,
+        "elements": elements,
+        "num_nodes": num_nodes,
+        "num_nodes_per_element": 4,
+        "num_elements": elements.shape[0],
+        # Regular grid description, allowing PyVista to skip the explicit connectivity
+        "dimensions": (num_elements_x + 1, num_elements_y + 1, 1),
+        "spacing": (width / num_elements_x, height / num_elements_y, 1.0),
+        "origin": (0.0, 0.0, 0.0),
+    }
+
+
+def shutdown() -> None:
+    """Finalize Gmsh session shared by all managers, call at end of program"""
+
+    if _GMSH_REFS > 0:
+        raise RuntimeError(f"Cannot shut down Gmsh while {_GMSH_REFS} manager(s) are still active.")
+    if gmsh.is_initialized():
+        gmsh.finalize()
+    _OPTION_CACHE.clear()
+
 
 class Manager:
-    """Context manager for Gmsh initialization, meshing, finalization, and more"""
+    """
+    Context manager for Gmsh initialization, meshing, finalization, and more
+
+    Note:
+        Gmsh is initialized by the first manager and kept alive afterwards, so that meshing in a loop does not
+        pay the initialization cost every time. Each manager only adds and removes its own model. Call
+        `rippl.gmsh.shutdown()` at the end of the program to finalize Gmsh.
+    """
 
     def __init__(
         self,
@@ -14,26 +110,85 @@ class Manager:
         model_name: str = "Rippl mesh",
         mesh_file_name: str = "mesh.msh",
         debug_mode: bool = False,
+        cache_mesh: bool = False,
+        cache_dir: Path = _MESH_CACHE_DIR,
+        export_mesh_on_exit: bool = False,
     ):
         self.output_dir = output_dir
         self.mesh_file = self.output_dir / Path(mesh_file_name)
+        self._mesh_file_str = self.mesh_file.as_posix()  # Gmsh expects strings
+        self.cache_mesh = cache_mesh
+        self.cache_dir = cache_dir
+        self.export_mesh_on_exit = export_mesh_on_exit
+        self._write_future: Future | None = None
+        self._analytic_mesh = False  # mesh data created without Gmsh, so the model holds no mesh to export
 
         self.model = gmsh.model
         self.model_name = model_name
         self.debug_mode = debug_mode
 
     def __enter__(self):
-        gmsh.initialize()
+        global _GMSH_REFS
+        if _GMSH_REFS == 0 and not gmsh.is_initialized():
+            gmsh.initialize()  # initialized only once and reused by subsequent managers until `shutdown()`
+            _OPTION_CACHE.clear()  # initialization resets all options to their defaults
+        _GMSH_REFS += 1
         self.model.add(self.model_name)
-        logging.info(f"Model name: {self.model_name}")
-        gmsh.option.set_number("General.Terminal", self.debug_mode)
-        gmsh.option.set_number("General.Tooltips", self.debug_mode)
+        logging.info("Model name: %s", self.model_name)
+        self._apply_options(
+            {
+                "General.Terminal": self.debug_mode,
+                "General.Tooltips": self.debug_mode,
+            }
+        )
         return self
 
-    def __exit__(self, *_):
-        gmsh.finalize()
+    def __exit__(self, exc_type, *_):
+        global _GMSH_REFS
+        try:
+            if self.export_mesh_on_exit and exc_type is None:
+                self.export_mesh()
+        finally:
+            try:
+                self._wait_for_export()
+            finally:
+                # Always release the model and the session reference, otherwise `shutdown()` is blocked for good
+                self.model.set_current(self.model_name)
+                self.model.remove()
+                _GMSH_REFS -= 1
+                if _GMSH_REFS == 0:
+                    gmsh.clear()  # post-processing views (e.g. size maps of quasi-structured meshing) outlive the model and would affect the next mesh
+
+    def _apply_options(self, options: dict[str, float]) -> None:
+        """
+        Set Gmsh number options, skipping those that already have the requested value
+
+        Note:
+            Options set directly via `gmsh.option` are not tracked and might be overwritten or skipped.
+        """
+
+        for name, value in options.items():
+            if _OPTION_CACHE.get(name) != value:
+                gmsh.option.set_number(name, value)
+                _OPTION_CACHE[name] = value
+
+    def _wait_for_export(self) -> None:
+        """Block until a running `export_mesh()` has finished writing, needed before the model is used again"""
+
+        write_future, self._write_future = self._write_future, None  # a failed write is only reported once
+        if write_future is not None:
+            try:
+                write_future.result()
+            except Exception as e:
+                raise RuntimeError(f"Writing {self._mesh_file_str} failed") from e
+
+    def _run_gui(self) -> None:
+        self._wait_for_export()
+        gmsh.fltk.run()
+        _OPTION_CACHE.clear()  # options might have been changed interactively
 
     def get_model_name(self) -> str:
+        self._wait_for_export()
         return self.model.get_current()
 
     def show_geometry(
@@ -47,13 +202,17 @@ class Manager:
     ) -> None:
         """Open GUI to show created geometry"""
 
-        gmsh.option.set_number("Geometry.Points", points)
-        gmsh.option.set_number("Geometry.Lines", lines)
-        gmsh.option.set_number("Geometry.Surfaces", surfaces)
-        gmsh.option.set_number("Geometry.PointNumbers", point_numbers)
-        gmsh.option.set_number("Geometry.LineNumbers", line_numbers)
-        gmsh.option.set_number("Geometry.SurfaceNumbers", surface_numbers)
-        gmsh.fltk.run()
+        self._apply_options(
+            {
+                "Geometry.Points": points,
+                "Geometry.Lines": lines,
+                "Geometry.Surfaces": surfaces,
+                "Geometry.PointNumbers": point_numbers,
+                "Geometry.LineNumbers": line_numbers,
+                "Geometry.SurfaceNumbers": surface_numbers,
+            }
+        )
+        self._run_gui()
 
     def show_mesh(
         self,
@@ -63,16 +222,43 @@ class Manager:
     ) -> None:
         """Open GUI to show created mesh"""
 
-        gmsh.option.set_number("Geometry.Points", False)
-        gmsh.option.set_number("Geometry.Lines", False)
-        gmsh.option.set_number("Geometry.Surfaces", False)
-        gmsh.option.set_number("Mesh.SurfaceFaces", element_surfaces)
-        gmsh.option.set_number("Mesh.PointNumbers", node_numbers)
-        gmsh.option.set_number("Mesh.SurfaceNumbers", element_numbers)
-        gmsh.fltk.run()
+        self._apply_options(
+            {
+                "Geometry.Points": False,
+                "Geometry.Lines": False,
+                "Geometry.Surfaces": False,
+                "Mesh.SurfaceFaces": element_surfaces,
+                "Mesh.PointNumbers": node_numbers,
+                "Mesh.SurfaceNumbers": element_numbers,
+            }
+        )
+        self._run_gui()
 
     def export_mesh(self) -> None:
-        gmsh.write(self.mesh_file.as_posix())
+        """
+        Write mesh file in a background thread
+
+        Note:
+            Python code not touching Gmsh (e.g. processing `mesh_data`) runs in parallel to the file being written.
+            Methods of this manager wait for the write to finish before using the model again, at the latest when
+            leaving the context. Errors of the write are raised from there as `RuntimeError`. The Gmsh API is not
+            thread-safe, so do not call `gm.model` or `gmsh.*` directly while a write is pending.
+        """
+
+        if self._analytic_mesh:
+            raise RuntimeError("Cannot export mesh created with `analytic=True`, since the Gmsh model holds no mesh.")
+        self._wait_for_export()
+        executor = ThreadPoolExecutor(max_workers=1)
+        self._write_future = executor.submit(gmsh.write, self._mesh_file_str)
+        executor.shutdown(wait=False)  # worker thread exits once the write is done
+
+    def _mesh_cache_file(self, dim: int, mesh_options: dict, geometry_params: dict) -> Path:
+        """Get cache file whose name is a hash of the mesh options, geometry parameters and model entities"""
+
+        entities = [(d, t, self.model.get_bounding_box(d, t)) for d, t in self.model.get_entities()]
+        key = repr((dim, sorted(mesh_options.items()), sorted(geometry_params.items()), entities))
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return self.cache_dir / Path(f"mesh_{digest}.msh")
 
     def mesh(
         self,
@@ -83,50 +269,84 @@ class Manager:
         element_order: int = 1,
         smoothing: int = 100,
         transfinite_automatic: bool = False,
+        geometry_params: dict | None = None,
     ) -> None:
-        """Mesh created geometry with sane defaults"""
+        """
+        Mesh created geometry with sane defaults
+
+        Note:
+            If `cache_mesh` is enabled, the generated mesh is stored as binary `mesh_<hash>.msh` in `cache_dir` and merged
+            into the model instead of being regenerated on subsequent runs with the same geometry and options. By default,
+            `cache_dir` is `~/.cache/rippl`, so the cache survives timestamped output directories of repeated runs.
+            Mesh constraints that do not show up in the geometry itself (e.g. transfinite curves) must be part of
+            `geometry_params` to distinguish cache files.
+        """
+
+        self._wait_for_export()
+        mesh_options = {
+            "mesh_size": mesh_size,
+            "recombine_all": recombine_all,
+            "quasi_structured": quasi_structured,
+            "element_order": element_order,
+            "smoothing": smoothing,
+            "transfinite_automatic": transfinite_automatic,
+        }
+        cache_file = self._mesh_cache_file(dim, mesh_options, geometry_params or {}) if self.cache_mesh else None
 
-        if self.mesh_file.exists():
-            gmsh.open(self.mesh_file.as_posix())
+        if cache_file is not None and cache_file.exists():
+            gmsh.merge(cache_file.as_posix())  # keeps current model and its geometry, only adds the mesh
+            logging.info("Loaded cached mesh: %s", cache_file)
         else:
-            if mesh_size:
-                gmsh.option.set_number("Mesh.MeshSizeFromPoints", False)
-                gmsh.option.set_number("Mesh.MeshSizeMin", mesh_size)
-                gmsh.option.set_number("Mesh.MeshSizeMax", mesh_size)
-            gmsh.option.set_number("Mesh.RecombineAll", recombine_all)
-            if quasi_structured:
-                gmsh.option.set_number("Mesh.Algorithm", 11)  # quasi-structured
-            gmsh.option.set_number("Mesh.ElementOrder", element_order)
-            gmsh.option.set_number("Mesh.Smoothing", smoothing)
+            # Always set all options explicitly since they persist in the shared Gmsh session
+            self._apply_options(
+                {
+                    "Mesh.MeshSizeFromPoints": not mesh_size,
+                    "Mesh.MeshSizeMin": mesh_size if mesh_size else 0.0,  # Gmsh default
+                    "Mesh.MeshSizeMax": mesh_size if mesh_size else 1.0e22,  # Gmsh default
+                    "Mesh.RecombineAll": recombine_all,
+                    "Mesh.Algorithm": 11 if quasi_structured else 6,  # quasi-structured or Gmsh default (Frontal-Delaunay)
+                    "Mesh.ElementOrder": element_order,
+                    "Mesh.Smoothing": smoothing,
+                }
+            )
             if transfinite_automatic:
                 self.model.mesh.set_transfinite_automatic()
             self.model.mesh.generate(dim=dim)
+            if cache_file is not None:
+                binary = gmsh.option.get_number("Mesh.Binary")
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                self._apply_options({"Mesh.Binary": True})  # binary files are much faster to read back
+                gmsh.write(cache_file.as_posix())
+                self._apply_options({"Mesh.Binary": binary})
+                logging.info("Cached mesh: %s", cache_file)
 
         # Get nodes
         node_tags, node_coords, _ = self.model.mesh.get_nodes()
-        node_tags -= 1
-        nodes = node_coords.reshape(-1, 3)
+        nodes = node_coords.reshape(-1, 3)  # view, no copy
         num_nodes = nodes.shape[0]
-        logging.info(f"Number of nodes: {num_nodes}")
+        logging.info("Number of nodes: %d", num_nodes)
 
         # Get elements
         element_types, _, element_node_tags_list = self.model.mesh.get_elements(dim=dim)
         if element_types.shape[0] != 1:
             raise NotImplementedError(f"Currently not supporting multiple element types. element_types = {[self.model.mesh.get_element_properties(i)[0] for i in element_types]}")
-        if element_types[0] == 3:
-            num_nodes_per_element = 4  # bi-linear quadrilateral elements
-        elif element_types[0] == 5:
-            num_nodes_per_element = 8  # tri-linear hexahedral elements
-        elif element_types[0] == 10:
-            num_nodes_per_element = 9  # bi-quadratic quadrilateral elements
-        elif element_types[0] == 12:
-            num_nodes_per_element = 27  # tri-quadratic hexahedral elements
-        else:
+        try:
+            num_nodes_per_element = _GMSH_ELEMENT_NODES[element_types[0]]
+        except KeyError:
             raise NotImplementedError(f"Currently only supporting quadrilateral and hexahedral elements. Mesh needs to be changed. element_types = {[self.model.mesh.get_element_properties(i)[0] for i in element_types]}")
 
-        elements = np.int64(element_node_tags_list[0].reshape(-1, num_nodes_per_element) - 1)  # for compatibility with PyVista, make sure to use int64 (by default, you get uint64 here)
+        element_node_tags = element_node_tags_list[0]
+        if num_nodes > 0 and node_tags[0] == 1 and node_tags[-1] == num_nodes and np.all(node_tags[1:] > node_tags[:-1]):
+            # Node tags are 1, ..., num_nodes in order (and thus fit into int64), so node indices are just shifted tags
+            elements = element_node_tags.view(np.int64).reshape(-1, num_nodes_per_element)  # for compatibility with PyVista, make sure to use int64 (by default, you get uint64 here), reinterpreting the buffer avoids a copy
+            elements -= 1
+        else:
+            # Non-contiguous or unordered node tags (e.g. after renumbering or partitioning) need to be mapped to node indices
+            order = np.argsort(node_tags)
+            elements = order[np.searchsorted(node_tags[order], element_node_tags)].reshape(-1, num_nodes_per_element)
         num_elements = elements.shape[0]
-        logging.info(f"Number of elements: {num_elements}")
+        logging.info("Number of elements: %d", num_elements)
+        logging.debug("Memory of nodes and elements: %.2f MiB", (nodes.nbytes + elements.nbytes) / 1024**2)
 
         # Store mesh data
         self.mesh_data = {
@@ -136,6 +356,42 @@ class Manager:
             "num_nodes_per_element": num_nodes_per_element,
             "num_elements": num_elements,
         }
+        self._analytic_mesh = False
+
+    def _mesh_plane(
+        self,
+        plane: int,
+        show_geometry: bool,
+        dim: int,
+        mesh_size: float | bool,
+        recombine_all: bool,
+        quasi_structured: bool,
+        element_order: int,
+        smoothing: int,
+        transfinite_automatic: bool,
+        show_mesh: bool,
+        geometry_params: dict,
+    ) -> None:
+        """Shared final steps of all `create_*` methods on synchronized geometry"""
+
+        if show_geometry:
+            self.show_geometry()
+
+        # Generate mesh
+        self.mesh(
+            dim=dim,
+            mesh_size=mesh_size,
+            recombine_all=recombine_all,
+            quasi_structured=quasi_structured,
+            element_order=element_order,
+            smoothing=smoothing,
+            transfinite_automatic=transfinite_automatic,
+            geometry_params=geometry_params,
+        )
+        if show_mesh:
+            self.show_mesh()
+
+        self.model.add_physical_group(dim, [plane])
 
     def create_dogbone(
         self,
@@ -153,6 +409,8 @@ class Manager:
         transfinite_automatic: bool = False,
         show_mesh: bool = False,
     ) -> None:
+        self._wait_for_export()
+
         # Add basic geometric entities
         x, y, z = 0.0, 0.0, 0.0  # position of bottom left point of rectangle
         rec = self.model.occ.add_rectangle(x, y, z, width, height)
@@ -176,13 +434,13 @@ class Manager:
             ],
         )[0][0][1]
 
-        # Synchronize and visualize geometry
-        self.model.occ.synchronize()  # needs to be called before any use of functions outside of the GEO kernel
-        if show_geometry:
-            self.show_geometry()
+        # Synchronize geometry
+        self.model.occ.synchronize()  # needs to be called before any use of functions outside of the OCC kernel
 
-        # Generate mesh
-        self.mesh(
+        # Visualize geometry, generate mesh and add physical group
+        self._mesh_plane(
+            plane,
+            show_geometry=show_geometry,
             dim=dim,
             mesh_size=mesh_size,
             recombine_all=recombine_all,
@@ -190,11 +448,9 @@ class Manager:
             element_order=element_order,
             smoothing=smoothing,
             transfinite_automatic=transfinite_automatic,
+            show_mesh=show_mesh,
+            geometry_params={"width": width, "gauge": gauge, "height": height, "height_inner": height_inner},
         )
-        if show_mesh:
-            self.show_mesh()
-
-        self.model.add_physical_group(dim, [plane])
 
     def create_notched(
         self,
@@ -212,6 +468,8 @@ class Manager:
         # show_mesh: bool = False,
         show_mesh: bool = True,
     ) -> None:
+        self._wait_for_export()
+
         # Add basic geometric entities
         x, y, z = 0.0, 0.0, 0.0  # position of bottom left point of rectangle
         rec = self.model.occ.add_rectangle(x, y, z, width, height)
@@ -225,13 +483,13 @@ class Manager:
             ],
         )[0][0][1]
 
-        # Synchronize and visualize geometry
-        self.model.occ.synchronize()  # needs to be called before any use of functions outside of the GEO kernel
-        if show_geometry:
-            self.show_geometry()
+        # Synchronize geometry
+        self.model.occ.synchronize()  # needs to be called before any use of functions outside of the OCC kernel
 
-        # Generate mesh
-        self.mesh(
+        # Visualize geometry, generate mesh and add physical group
+        self._mesh_plane(
+            plane,
+            show_geometry=show_geometry,
             dim=dim,
             mesh_size=mesh_size,
             recombine_all=recombine_all,
@@ -239,11 +497,9 @@ class Manager:
             element_order=element_order,
             smoothing=smoothing,
             transfinite_automatic=transfinite_automatic,
+            show_mesh=show_mesh,
+            geometry_params={"width": width, "height": height, "radius": radius},
         )
-        if show_mesh:
-            self.show_mesh()
-
-        self.model.add_physical_group(dim, [plane])
 
     def create_rectangle(
         self,
@@ -260,38 +516,43 @@ class Manager:
         smoothing: int = 100,
         transfinite_automatic: bool = False,
         show_mesh: bool = False,
+        analytic: bool = False,
     ) -> None:
+        self._wait_for_export()
+
+        # Bypass Gmsh for pure transfinite meshes of bi-linear quadrilateral elements, leaving the Gmsh model empty
+        if analytic:
+            if dim != 2 or not recombine_all or quasi_structured or element_order != 1 or mesh_size or transfinite_automatic or show_geometry or show_mesh:
+                raise ValueError("`analytic=True` requires a transfinite mesh of bi-linear quadrilateral elements (dim=2, recombine_all=True, element_order=1) without GUI.")
+            if self.export_mesh_on_exit:
+                raise ValueError("`analytic=True` cannot be combined with `export_mesh_on_exit=True`, since the Gmsh model holds no mesh.")
+            self.mesh_data = create_rectangle_analytic(width, height, num_elements_x, num_elements_y)
+            self._analytic_mesh = True
+            logging.info("Number of nodes: %d", self.mesh_data["num_nodes"])
+            logging.info("Number of elements: %d", self.mesh_data["num_elements"])
+            return
+
         # Add basic geometric entities
         x, y, z = 0.0, 0.0, 0.0  # position of bottom left point of rectangle
-        p1 = self.model.geo.add_point(x, y, z)
-        p2 = self.model.geo.add_point(x + width, y, z)
-        p3 = self.model.geo.add_point(x + width, y + height, z)
-        p4 = self.model.geo.add_point(x, y + height, z)
-        c1 = self.model.geo.add_line(p1, p2)
-        c2 = self.model.geo.add_line(p2, p3)
-        c3 = self.model.geo.add_line(p3, p4)
-        c4 = self.model.geo.add_line(p4, p1)
-        curve_loop = self.model.geo.add_curve_loop([c1, c2, c3, c4])  # ordered list of connected curves, a sign being associated with each curve (depending on the orientation of the curve to form a loop)
-        plane = self.model.geo.add_plane_surface([curve_loop])  # list of curve loops
+        plane = self.model.occ.add_rectangle(x, y, z, width, height)  # creates points, curves, curve loop and plane surface at once
+        self.model.occ.synchronize()  # needs to be called before any use of functions outside of the OCC kernel
+        c1, c2, c3, c4 = [tag for _, tag in self.model.get_boundary([(2, plane)], oriented=False)]  # bottom, right, top and left edge
 
         # Set node distribution on curves (nodes = elements + 1)
-        self.model.geo.mesh.set_transfinite_curve(c1, num_elements_x + 1)  # bottom edge
-        self.model.geo.mesh.set_transfinite_curve(c3, num_elements_x + 1)  # top edge
-        self.model.geo.mesh.set_transfinite_curve(c2, num_elements_y + 1)  # right edge
-        self.model.geo.mesh.set_transfinite_curve(c4, num_elements_y + 1)  # left edge
-        logging.info(f"Number of elements in x-direction: {num_elements_x}")
-        logging.info(f"Number of elements in y-direction: {num_elements_y}")
+        self.model.mesh.set_transfinite_curve(c1, num_elements_x + 1)  # bottom edge
+        self.model.mesh.set_transfinite_curve(c3, num_elements_x + 1)  # top edge
+        self.model.mesh.set_transfinite_curve(c2, num_elements_y + 1)  # right edge
+        self.model.mesh.set_transfinite_curve(c4, num_elements_y + 1)  # left edge
+        logging.info("Number of elements in x-direction: %d", num_elements_x)
+        logging.info("Number of elements in y-direction: %d", num_elements_y)
 
         # Apply transfinite rule to surface
-        self.model.geo.mesh.set_transfinite_surface(plane)
+        self.model.mesh.set_transfinite_surface(plane)
 
-        # Synchronize and visualize geometry
-        self.model.geo.synchronize()  # needs to be called before any use of functions outside of the GEO kernel
-        if show_geometry:
-            self.show_geometry()
-
-        # Generate mesh
-        self.mesh(
+        # Visualize geometry, generate mesh and add physical group
+        self._mesh_plane(
+            plane,
+            show_geometry=show_geometry,
             dim=dim,
             mesh_size=mesh_size,
             recombine_all=recombine_all,
@@ -299,8 +560,6 @@ class Manager:
             element_order=element_order,
             smoothing=smoothing,
             transfinite_automatic=transfinite_automatic,
+            show_mesh=show_mesh,
+            geometry_params={"width": width, "height": height, "num_elements_x": num_elements_x, "num_elements_y": num_elements_y},
         )
-        if show_mesh:
-            self.show_mesh()
-
-        self.model.add_physical_group(dim, [plane])
@@ -1,12 +1,29 @@
+from __future__ import annotations
+
+import atexit
+import functools
 import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-import pyvista as pv
 from numpy.typing import NDArray
 
+from .gmsh import _vtk_cell_type
+
+if TYPE_CHECKING:  # PyVista, VTK and Pillow are imported where needed, so importing rippl does not load VTK
+    import pyvista as pv
+    from vtkmodules.vtkCommonDataModel import vtkCellArray
+
+prange = range  # replaced by `numba.prange` before `_min_max` is compiled
+_NUMBA_MIN_VALUES = 1_000_000  # below this, two NumPy reductions are faster than paying for threads and JIT compilation
+_PLOTTER_POOL: list[pv.Plotter] = []  # off-screen plotters reused across plots instead of creating new render contexts
+_SYMBOL_STRIP = str.maketrans("", "", "'\"()[]{}")  # symbols removed from quantity names to get export file names
+
 
 @dataclass
 class Settings:
@@ -47,93 +64,265 @@ class Settings:
         self.sync()
 
     def sync(self) -> None:
+        import pyvista as pv
+
         self.n_colors = 256 if self.color_smooth else 14
-        pv.global_theme.transparent_background = self.transparent_background
+        if pv.global_theme.transparent_background != self.transparent_background:  # only touch global state on change
+            pv.global_theme.transparent_background = self.transparent_background
+
+
+def _cell_array(elements: NDArray[np.int64]) -> vtkCellArray:
+    """
+    Get VTK cell array from offsets and connectivity (VTK 9 layout)
+
+    Note:
+        The connectivity is a flat view of `elements` (no copy, if it is a contiguous array of VTK's id type), so
+        `elements` must not be modified in place afterwards.
+    """
+
+    import pyvista as pv
+    from vtkmodules.util.numpy_support import numpy_to_vtkIdTypeArray
+    from vtkmodules.vtkCommonDataModel import vtkCellArray
+
+    num_elements, num_nodes_per_element = elements.shape
+    offsets = np.arange(0, (num_elements + 1) * num_nodes_per_element, num_nodes_per_element, dtype=pv.ID_TYPE)
+    connectivity = np.ascontiguousarray(elements, dtype=pv.ID_TYPE).ravel()
+    cell_array = vtkCellArray()
+    cell_array.SetData(numpy_to_vtkIdTypeArray(offsets), numpy_to_vtkIdTypeArray(connectivity))  # shallow, arrays are kept alive by VTK arrays
+    return cell_array
+
+
+def _min_max(data: NDArray) -> tuple[float, float]:
+    """Get minimum and maximum of flat array ignoring NaN in a single parallel pass, see `_compiled_min_max()`"""
+
+    data_min = np.inf
+    data_max = -np.inf
+    for i in prange(data.shape[0]):
+        if not np.isnan(data[i]):
+            data_min = min(data_min, data[i])
+            data_max = max(data_max, data[i])
+    return data_min, data_max
+
+
+@functools.cache
+def _compiled_min_max():
+    """Compile `_min_max()` with Numba on first use, None if Numba is not installed (imported lazily, since it is slow)"""
+
+    global prange
+    try:
+        import numba
+    except ImportError:  # Numba is optional, NumPy is used instead
+        return None
+    prange = numba.prange
+    return numba.njit(parallel=True, cache=True)(_min_max)
+
+
+def _reorder_nodes(mesh_data: dict) -> tuple[dict, NDArray[np.int64]]:
+    """
+    Renumber nodes using the Reverse Cuthill-McKee algorithm for better memory locality in VTK (requires SciPy)
+
+    Returns mesh data with reordered nodes and the permutation, i.e. new node `i` is old node `permutation[i]`.
+    """
+
+    try:
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import reverse_cuthill_mckee
+    except ImportError as e:
+        raise ImportError("Reordering nodes requires SciPy, e.g. install it using `uv add scipy`.") from e
+
+    # Node adjacency as product of node-element incidence matrix with its transpose
+    elements = mesh_data["elements"]
+    num_nodes = mesh_data["nodes"].shape[0]
+    incidence = csr_matrix(
+        (
+            np.ones(elements.size, dtype=np.int32),
+            (elements.ravel(), np.repeat(np.arange(elements.shape[0]), elements.shape[1])),
+        ),
+        shape=(num_nodes, elements.shape[0]),
+    )
+    permutation = reverse_cuthill_mckee(incidence @ incidence.T, symmetric_mode=True).astype(np.int64)
+    inverse_permutation = np.empty_like(permutation)
+    inverse_permutation[permutation] = np.arange(num_nodes)
+
+    reordered_mesh_data = {key: value for key, value in mesh_data.items() if key not in ("dimensions", "spacing", "origin")}  # grid description is invalid after renumbering
+    reordered_mesh_data["nodes"] = mesh_data["nodes"][permutation]
+    reordered_mesh_data["elements"] = inverse_permutation[elements]
+    return reordered_mesh_data, permutation
+
+
+def get_mesh(mesh_data: dict | pv.DataSet, coordinate_dtype: type = np.float32) -> pv.DataSet:
+    """
+    Create PyVista mesh from mesh data of `rippl.gmsh.Manager`
+
+    Notes:
+        - Mesh data of regular grids carrying `dimensions`, `spacing` and `origin` (e.g. from
+          `rippl.gmsh.create_rectangle_analytic()`) become a `pyvista.ImageData` without any explicit connectivity. Its
+          point and cell ordering (x fastest, then y, then z) matches the node and element numbering of the mesh data.
+        - Node coordinates are converted to `coordinate_dtype`. Single precision halves the geometry moved through VTK
+          and to the GPU without visible difference, use `np.float64` if the coordinates are used for computations.
+        - The connectivity of an unstructured grid shares memory with `mesh_data["elements"]` (if it is a contiguous
+          int64 array, as created by `rippl.gmsh.Manager.mesh()`). Modifying the elements in place afterwards corrupts
+          the grid, pass `elements.copy()` if they are still changed.
+    """
+
+    import pyvista as pv
+
+    if isinstance(mesh_data, pv.DataSet):
+        return mesh_data
+
+    if "dimensions" in mesh_data:
+        return pv.ImageData(dimensions=mesh_data["dimensions"], spacing=mesh_data["spacing"], origin=mesh_data["origin"])
+
+    mesh = pv.UnstructuredGrid()
+    mesh.points = np.ascontiguousarray(mesh_data["nodes"], dtype=coordinate_dtype)
+    mesh.SetCells(_vtk_cell_type(mesh_data["num_nodes_per_element"]), _cell_array(mesh_data["elements"]))  # single cell type for all cells
+    return mesh
+
+
+def _acquire_plotter() -> pv.Plotter:
+    """Get cleared off-screen plotter from pool or create new one"""
+
+    import pyvista as pv
+
+    if _PLOTTER_POOL:
+        return _PLOTTER_POOL.pop()
+    return pv.Plotter(off_screen=True)
+
+
+def _release_plotter(plotter: pv.Plotter) -> None:
+    """Clear plotter and return it to pool"""
+
+    plotter.clear()
+    _PLOTTER_POOL.append(plotter)
+
+
+@atexit.register
+def _close_plotters() -> None:
+    """Close all pooled plotters"""
+
+    while _PLOTTER_POOL:
+        _PLOTTER_POOL.pop().close()
+
+
+def _render_one(mesh_file: Path, output_dir: Path, plot_kwargs: dict) -> None:
+    """Render single plot in worker process of `Manager.batch_plot()`"""
+
+    import pyvista as pv
+
+    Manager(output_dir=output_dir, mesh_data=pv.read(mesh_file)).plot(**plot_kwargs)
 
 
 class Manager:
-    """Context manager for PyVista"""
+    """
+    Manager for plotting with PyVista
 
-    def __init__(self, output_dir: Path, mesh_data: dict | pv.UnstructuredGrid):
+    Note:
+        - The mesh is created on construction, so using the manager as context manager is optional.
+        - With `reorder_nodes = True`, nodes are renumbered once using the Reverse Cuthill-McKee algorithm (requires
+          SciPy) for better memory locality in VTK. Point data in original node numbering then needs to be permuted,
+          e.g. `pm.mesh["u"] = u[pm.node_permutation]`. Cell ordering is not changed.
+    """
+
+    def __init__(self, output_dir: Path, mesh_data: dict | pv.DataSet, reorder_nodes: bool = False, coordinate_dtype: type = np.float32):
         self.output_dir = output_dir
         self.mesh_data = mesh_data
+        self.node_permutation = None
+        if reorder_nodes:
+            if not isinstance(mesh_data, dict):
+                raise ValueError("Reordering nodes requires mesh data as dict, not an existing PyVista mesh.")
+            mesh_data, self.node_permutation = _reorder_nodes(mesh_data)
+        self.mesh = get_mesh(mesh_data, coordinate_dtype=coordinate_dtype)
+        self._point_mesh = None
+        self._point_mesh_source = None
+        self._point_mesh_time = -1
 
     def __enter__(self):
-        self._import_mesh()
         return self
 
     def __exit__(self, *_):
-        pass
-
-    def _connectivity(self) -> NDArray[np.int64]:
-        """Get vector containing the connectivity information for PyVista.UnstructuredGrid"""
-
-        return np.hstack(
-            [
-                np.full(
-                    (self.mesh_data["elements"].shape[0], 1),
-                    self.mesh_data["num_nodes_per_element"],
-                ),
-                self.mesh_data["elements"],
-            ],
-        ).flatten()
-
-    def _cell_type_array(self) -> NDArray[np.int64]:
-        """
-        Set array containing VTK cell type number
+        _close_plotters()
 
-        See: https://vtk.org/doc/nightly/html/vtkCellType_8h_source.html
-        """
+    def _get_point_mesh(self) -> pv.DataSet:
+        """Get mesh with cell data interpolated to points, only recomputed after `mesh` was rebound or modified"""
 
-        vtk_cell_types = {
-            # Linear cells
-            "VTK_QUAD": 9,
-            "VTK_HEXAHEDRON": 12,
-            # Quadratic, isoparametric cells
-            "VTK_BIQUADRATIC_QUAD": 28,
-            "VTK_TRIQUADRATIC_HEXAHEDRON": 29,
-        }
-
-        if self.mesh_data["num_nodes_per_element"] == 4:
-            vtk_num = vtk_cell_types["VTK_QUAD"]
-        elif self.mesh_data["num_nodes_per_element"] == 9:
-            vtk_num = vtk_cell_types["VTK_BIQUADRATIC_QUAD"]
-        elif self.mesh_data["num_nodes_per_element"] == 8:
-            vtk_num = vtk_cell_types["VTK_HEXAHEDRON"]
-        elif self.mesh_data["num_nodes_per_element"] == 27:
-            vtk_num = vtk_cell_types["VTK_TRIQUADRATIC_HEXAHEDRON"]
-        else:
-            raise ValueError("Used cell type is not implemented!")
+        modified_time = self.mesh.GetMTime()  # includes modification of point and cell data arrays
+        if self._point_mesh_source is not self.mesh or self._point_mesh_time != modified_time:
+            self._point_mesh = self.mesh.cell_data_to_point_data()
+            self._point_mesh_source = self.mesh
+            self._point_mesh_time = modified_time
+        return self._point_mesh
 
-        return vtk_num * np.ones(self.mesh_data["num_elements"], dtype=np.int64)
+    def _add_scene(self, plotter: pv.Plotter, pv_set: Settings, quantity_name: str) -> None:
+        """Add mesh, scalar bar, axes and camera of one plot to plotter"""
 
-    def _import_mesh(self) -> None:
-        if isinstance(self.mesh_data, pv.UnstructuredGrid):
-            self.mesh = self.mesh_data
+        if quantity_name.lower() == "mesh" or quantity_name in self.mesh.point_data:
+            plot_mesh = self.mesh  # nothing to interpolate
+        else:
+            plot_mesh = self._get_point_mesh()
+        plotter.add_mesh(
+            plot_mesh,
+            scalars=None if quantity_name.lower() == "mesh" else quantity_name,
+            n_colors=pv_set.n_colors,
+            cmap=pv_set.color_map,
+            clim=[pv_set.color_limits_min, pv_set.color_limits_max],
+            show_edges=pv_set.show_edges,
+            scalar_bar_args={
+                "height": pv_set.scalar_bar_height,
+                "width": pv_set.scalar_bar_width,
+                "vertical": pv_set.scalar_bar_vertical,
+                "title": quantity_name,
+                "shadow": pv_set.scalar_bar_shadow,
+                "n_labels": pv_set.scalar_bar_n_labels,
+                "n_colors": pv_set.n_colors,
+                "position_x": pv_set.scalar_bar_position_x,
+                "position_y": pv_set.scalar_bar_position_y,
+            },
+        )
+        if pv_set.show_axes:
+            plotter.show_axes()
         else:
-            self.mesh = pv.UnstructuredGrid(
-                self._connectivity(),
-                self._cell_type_array(),
-                self.mesh_data["nodes"],
-            )
+            plotter.hide_axes()  # pooled plotter might still show axes of previous plot
+        plotter.camera_position = pv_set.camera_position
+        plotter.window_size = pv_set.screenshot_resolution
+        plotter.image_scale = pv_set.image_scale
 
-    def plot(self, pv_set: Settings, quantity_name: str, export_name: str = None, plotter: Optional[pv.Plotter] = None) -> Optional[pv.Plotter]:
+    def plot(self, pv_set: Settings, quantity_name: str, export_name: str = None, plotter: Optional[pv.Plotter] = None, show: bool = False) -> Optional[pv.Plotter]:
         """
         Function to plot using PyVista.
 
         Notes:
             - At beginning of this function, PyVistaSettings are updated using `sync()` method.
             - Use `quantity_name = "mesh"` for only plotting the mesh.
+            - Use `show = True` to open an interactive window after exporting. The window gets its own on-screen
+              plotter, a passed `plotter` stays open and is returned as usual.
         """
 
+        import pyvista as pv
+        from PIL import Image
+        from vtkmodules.util.numpy_support import vtk_to_numpy
+
         pv_set.sync()
 
         if pv_set.color_limits_auto and (quantity_name.lower() != "mesh"):
             # Set proper color limits
-            data = self.mesh[quantity_name]
-            data = np.where(np.abs(data) < pv_set.color_limits_cutoff, 0.0, data)
-            pv_set.color_limits_min = data.min()
-            pv_set.color_limits_max = data.max()
+            # Values below cutoff count as zero. Only the extremes matter for that, so the data is never copied: if the
+            # minimum (maximum) is below cutoff, all smaller (larger) values are too and the limit becomes zero.
+            vtk_array = self.mesh.GetPointData().GetArray(quantity_name)
+            if vtk_array is None:  # not by truth value, which is the length of VTK arrays
+                vtk_array = self.mesh.GetCellData().GetArray(quantity_name)
+            if vtk_array is None:
+                raise KeyError(f"Data array '{quantity_name}' not found in mesh.")
+            data = vtk_to_numpy(vtk_array)  # zero-copy view, not modified below
+            min_max = _compiled_min_max() if data.size >= _NUMBA_MIN_VALUES else None
+            if min_max is not None:
+                data_min, data_max = min_max(data.ravel())
+            else:
+                data_min = np.fmin.reduce(data, axis=None, initial=np.inf)  # NaN ignored like in `_min_max()`
+                data_max = np.fmax.reduce(data, axis=None, initial=-np.inf)
+            if data_min > data_max:  # empty or all NaN, treated like constant zero data below
+                data_min = data_max = 0.0
+            pv_set.color_limits_min = 0.0 if abs(data_min) < pv_set.color_limits_cutoff else data_min
+            pv_set.color_limits_max = 0.0 if abs(data_max) < pv_set.color_limits_cutoff else data_max
             if np.isclose(pv_set.color_limits_min, pv_set.color_limits_max):
                 center = 0.0 if np.isclose(pv_set.color_limits_min, 0.0) else pv_set.color_limits_min
                 pv_set.color_limits_min = center - pv_set.color_limits_cutoff
@@ -142,55 +331,54 @@ class Manager:
         # Create plotter
         if plotter is None:
             return_plotter = False
-            plotter = pv.Plotter(off_screen=True)
+            plotter = _acquire_plotter()
         elif isinstance(plotter, pv.Plotter):
             return_plotter = True
         else:
             raise ValueError("`plotter` must be a pyvista.Plotter instance or None.")
-        plotter.add_mesh(
-            self.mesh.cell_data_to_point_data(),
-            scalars=None if quantity_name.lower() == "mesh" else quantity_name,
-            n_colors=pv_set.n_colors,
-            cmap=pv_set.color_map,
-            clim=[pv_set.color_limits_min, pv_set.color_limits_max],
-            show_edges=pv_set.show_edges,
-            scalar_bar_args={
-                "height": pv_set.scalar_bar_height,
-                "width": pv_set.scalar_bar_width,
-                "vertical": pv_set.scalar_bar_vertical,
-                "title": quantity_name,
-                "shadow": pv_set.scalar_bar_shadow,
-                "n_labels": pv_set.scalar_bar_n_labels,
-                "n_colors": pv_set.n_colors,
-                "position_x": pv_set.scalar_bar_position_x,
-                "position_y": pv_set.scalar_bar_position_y,
-            },
-        )
-        if pv_set.show_axes:
-            plotter.show_axes()
-        plotter.camera_position = pv_set.camera_position
-        plotter.window_size = pv_set.screenshot_resolution
-        if pv_set.image_scale > 1:
-            plotter.image_scale = pv_set.image_scale
+        self._add_scene(plotter, pv_set, quantity_name)
 
         if export_name is None:
-            quantity_name = quantity_name.lower()
-            quantity_name = quantity_name.replace(" ", "_")
-            symbols_to_remove = "'\"()[]{}"
-            quantity_name = quantity_name.translate(str.maketrans("", "", symbols_to_remove))
-        else:
-            quantity_name = export_name
+            export_name = quantity_name.lower().replace(" ", "_").translate(_SYMBOL_STRIP)
 
         if pv_set.export_png:
-            quantity_png_file = self.output_dir / Path(f"{quantity_name}.png")
-            plotter.screenshot(quantity_png_file)
-            logging.debug(f"Exported: {quantity_png_file}")
+            quantity_png_file = self.output_dir / Path(f"{export_name}.png")
+            # Pooled plotters keep the theme copied on creation, so the current background setting is passed explicitly
+            image = plotter.screenshot(transparent_background=pv_set.transparent_background, return_img=True)  # rendered image only, encoding is done below
+            Image.fromarray(image).save(quantity_png_file, compress_level=1)  # fast PNG compression, default level 6 is much slower for little size gain
+            logging.debug("Exported: %s", quantity_png_file)
         if pv_set.export_svg:
-            quantity_svg_file = self.output_dir / Path(f"{quantity_name}.svg")
+            quantity_svg_file = self.output_dir / Path(f"{export_name}.svg")
             plotter.save_graphic(quantity_svg_file)
-            logging.debug(f"Exported: {quantity_svg_file}")
+            logging.debug("Exported: %s", quantity_svg_file)
+
+        if show:
+            show_plotter = pv.Plotter()  # off-screen plotters have no interactive event loop
+            self._add_scene(show_plotter, pv_set, quantity_name)
+            show_plotter.show()  # closes plotter when window is closed
+        if not return_plotter:
+            _release_plotter(plotter)
 
         if return_plotter:
             return plotter
-        else:
-            plotter.close()
+
+    def batch_plot(self, jobs: list[dict], max_workers: Optional[int] = None) -> None:
+        """
+        Render independent plots in parallel, each in its own worker process with its own plotter.
+
+        Notes:
+            - Each job contains keyword arguments of `plot()`, e.g. `{"pv_set": pv_set, "quantity_name": "u"}`, except
+              `plotter` and `show`.
+            - The mesh is written once to a temporary file, which is read by the workers.
+            - Automatic color limits are only set on the workers' copies of the settings.
+            - Workers are spawned, not forked, so they do not inherit pooled plotters with render contexts of this
+              process or locks held by its threads.
+        """
+
+        with tempfile.TemporaryDirectory(dir=self.output_dir) as tmp_dir:
+            mesh_file = Path(tmp_dir) / Path("mesh.vtk")
+            self.mesh.save(mesh_file)
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(_render_one, mesh_file, self.output_dir, job) for job in jobs]
+                for future in futures:
+                    future.result()  # re-raises exceptions of workers